@@ -7,6 +7,7 @@ from diffpy.utils.scattering_objects.diffraction_objects import Diffraction_obje
 RADIUS_MM = 1
 N_POINTS_ON_DIAMETER = 300
 TTH_GRID = np.arange(1, 141, 1)
+_CVE_CACHE = {}
 
 
 class Gridded_circle:
@@ -26,6 +27,7 @@ class Gridded_circle:
         ys = np.linspace(-self.radius, self.radius, self.npoints)
         self.grid = {(x, y) for x in xs for y in ys if x**2 + y**2 <= self.radius**2}
         self.total_points_in_grid = len(self.grid)
+        self._grid_array = np.array(list(self.grid)).reshape(-1, 2)
 
     # def get_coordinate_index(self, coordinate):  # I think we probably dont need this function?
     #     count = 0
@@ -48,15 +50,10 @@ class Gridded_circle:
 
         Returns
         -------
-        the list of distances containing total distance, primary distance and secondary distance
+        the arrays of distances containing total distance, primary distance and secondary distance
 
         """
-        self.primary_distances, self.secondary_distances, self.distances = [], [], []
-        for coord in self.grid:
-            distance, primary, secondary = self.get_path_length(coord, angle)
-            self.distances.append(distance)
-            self.primary_distances.append(primary)
-            self.secondary_distances.append(secondary)
+        self.distances, self.primary_distances, self.secondary_distances = self._get_path_lengths_at_angle(angle)
 
     def set_muls_at_angle(self, angle):
         """
@@ -73,11 +70,9 @@ class Gridded_circle:
 
         """
         mu = self.mu
-        self.muls = []
         if len(self.distances) == 0:
             self.set_distances_at_angle(angle)
-        for distance in self.distances:
-            self.muls.append(np.exp(-mu * distance))
+        self.muls = np.exp(-mu * np.asarray(self.distances))
 
     def _get_entry_exit_coordinates(self, coordinate, angle):
         """
@@ -171,6 +166,88 @@ class Gridded_circle:
         total_distance = primary_distance + secondary_distance
         return total_distance, primary_distance, secondary_distance
 
+    def _get_path_lengths_at_angle(self, angle):
+        """
+        return the path lengths for all grid points at once
+
+        This is the array version of get_path_length: the entry and exit points of every
+        grid point are solved with numpy in one pass instead of one np.roots call per point.
+        Of the two intersections of the exit line with the circle we again keep the one above.
+
+        Parameters
+        ----------
+        angle float
+          the angle of the output beam in degrees
+
+        Returns
+        -------
+        arrays of total distances, primary distances and secondary distances, in grid order
+
+        """
+        angle_delta = 0.000001
+        if angle == float(0):
+            angle = angle + angle_delta
+        epsilon = 1e-7  # precision close to 90
+        angle = math.radians(angle)
+        xgrid, ygrid = self._grid_array[:, 0], self._grid_array[:, 1]
+        r_squared = self.radius**2
+
+        xentry = -np.sqrt(r_squared - ygrid**2)
+
+        if not math.isclose(angle, math.pi / 2, abs_tol=epsilon):
+            a = math.tan(angle)
+            b = ygrid - xgrid * a
+            sqrt_discriminant = np.sqrt(np.maximum((1 + a**2) * r_squared - b**2, 0))
+            xexit_root1 = (-a * b - sqrt_discriminant) / (1 + a**2)
+            xexit_root2 = (-a * b + sqrt_discriminant) / (1 + a**2)
+            yexit_root1 = a * xexit_root1 + b
+            yexit_root2 = a * xexit_root2 + b
+            pick_root2 = yexit_root2 >= yexit_root1
+            xexit = np.where(pick_root2, xexit_root2, xexit_root1)
+            yexit = np.where(pick_root2, yexit_root2, yexit_root1)
+        else:
+            xexit = xgrid
+            yexit = np.sqrt(r_squared - xgrid**2)
+
+        primary_distances = np.abs(xgrid - xentry)
+        secondary_distances = np.hypot(xgrid - xexit, ygrid - yexit)
+        total_distances = primary_distances + secondary_distances
+        return total_distances, primary_distances, secondary_distances
+
+
+def _get_cve_on_tth_grid(mud):
+    """
+    get the cve for the given mud on TTH_GRID
+
+    Parameters
+    ----------
+    mud float
+      the mu*D of the diffraction object, where D is the diameter of the circle
+
+    Returns
+    -------
+    a read-only array of the cve at each angle in TTH_GRID
+
+    The cve depends only on mud and the grid, not on the measured intensities,
+    so it is computed once per process for each mud and reused for every pattern.
+    """
+    key = (mud, TTH_GRID.dtype.str, TTH_GRID.tobytes())
+    if key not in _CVE_CACHE:
+        mu_sample_invmm = mud / 2
+        abs_correction = Gridded_circle(mu=mu_sample_invmm)
+        distances, muls = [], []
+        for angle in TTH_GRID:
+            abs_correction.set_distances_at_angle(angle)
+            abs_correction.set_muls_at_angle(angle)
+            distances.append(np.sum(abs_correction.distances))
+            muls.append(np.sum(abs_correction.muls))
+        distances = np.array(distances) / abs_correction.total_points_in_grid
+        muls = np.array(muls) / abs_correction.total_points_in_grid
+        cve = 1 / muls
+        cve.flags.writeable = False
+        _CVE_CACHE[key] = cve
+    return _CVE_CACHE[key]
+
 
 def compute_cve(diffraction_data, mud, wavelength):
     """
@@ -196,17 +273,7 @@ def compute_cve(diffraction_data, mud, wavelength):
     and finally interpolate cve to the original grid in diffraction_data.
     """
 
-    mu_sample_invmm = mud / 2
-    abs_correction = Gridded_circle(mu=mu_sample_invmm)
-    distances, muls = [], []
-    for angle in TTH_GRID:
-        abs_correction.set_distances_at_angle(angle)
-        abs_correction.set_muls_at_angle(angle)
-        distances.append(sum(abs_correction.distances))
-        muls.append(sum(abs_correction.muls))
-    distances = np.array(distances) / abs_correction.total_points_in_grid
-    muls = np.array(muls) / abs_correction.total_points_in_grid
-    cve = 1 / muls
+    cve = _get_cve_on_tth_grid(mud)
 
     orig_grid = diffraction_data.on_tth[0]
     newcve = np.interp(orig_grid, TTH_GRID, cve)
@@ -1,13 +1,44 @@
+import os
 import sys
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+
+import numpy as np
 
 from diffpy.labpdfproc.functions import apply_corr, compute_cve
 from diffpy.labpdfproc.tools import known_sources, load_metadata, preprocessing_args
 from diffpy.utils.parsers.loaddata import loadData
 from diffpy.utils.scattering_objects.diffraction_objects import XQUANTITIES, Diffraction_object
 
+_KNOWN_SOURCES_STR = f"{*known_sources, }"
+_XQUANTITIES_STR = f"{*XQUANTITIES, }"
 
-def get_args(override_cli_inputs=None):
+
+def _positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
+@lru_cache(maxsize=None)
+def create_parser():
+    """
+    Create the labpdfproc argument parser
+
+    Returns
+    -------
+    the argparse.ArgumentParser for the labpdfproc command line
+
+    The parser is built on the first call and the same instance is returned afterwards.
+    parse_args keeps no state on the parser, so it can be reused for any number of calls
+    in a process and does not need to be rebuilt between them.
+    """
     p = ArgumentParser()
     p.add_argument("mud", help="Value of mu*D for your " "sample. Required.", type=float)
     p.add_argument(
@@ -30,7 +61,7 @@ def get_args(override_cli_inputs=None):
         "-a",
         "--anode-type",
         help=f"The type of the x-ray source. Allowed values are "
-        f"{*[known_sources], }. Either specify a known x-ray source or specify wavelength.",
+        f"{_KNOWN_SOURCES_STR}. Either specify a known x-ray source or specify wavelength.",
         default="Mo",
     )
     p.add_argument(
@@ -53,7 +84,7 @@ def get_args(override_cli_inputs=None):
         "-x",
         "--xtype",
         help=f"The quantity on the independent variable axis. Allowed "
-        f"values: {*XQUANTITIES, }. If not specified then two-theta "
+        f"values: {_XQUANTITIES_STR}. If not specified then two-theta "
         f"is assumed for the independent variable. Only implemented for "
         f"tth currently.",
         default="tth",
@@ -72,6 +103,15 @@ def get_args(override_cli_inputs=None):
         action="store_true",
         help="Outputs will not overwrite existing file unless --force is specified.",
     )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of worker processes used to correct the input files. "
+        "Default is 1, which corrects the files one after another in the current process. "
+        "More workers only pay off for large numbers of input files.",
+        default=1,
+        type=_positive_int,
+    )
     p.add_argument(
         "-u",
         "--user-metadata",
@@ -98,49 +138,137 @@ def get_args(override_cli_inputs=None):
         "only if you want to override that behavior at runtime. ",
         default=None,
     )
-    args = p.parse_args(override_cli_inputs)
+    return p
+
+
+def get_args(override_cli_inputs=None):
+    args = create_parser().parse_args(override_cli_inputs)
     return args
 
 
+def _load_pattern(filepath, args):
+    """
+    Load the data in a single input file into a diffraction object
+
+    Parameters
+    ----------
+    filepath pathlib.Path
+        the path of the input data file
+    args argparse.Namespace
+        the preprocessed arguments from the parser
+
+    Returns
+    -------
+    the Diffraction_object holding the input data and its metadata
+
+    Plain two-column files are parsed directly by numpy.loadtxt. Anything it cannot read,
+    e.g. files with a non-commented header, falls back to loadData from diffpy.utils.
+    """
+    try:
+        xarray, yarray = np.loadtxt(filepath, ndmin=2).T
+    except ValueError:
+        xarray, yarray = loadData(filepath, unpack=True)
+    input_pattern = Diffraction_object(wavelength=args.wavelength)
+    input_pattern.insert_scattering_quantity(
+        xarray,
+        yarray,
+        "tth",
+        scat_quantity="x-ray",
+        name=filepath.stem,
+        metadata=load_metadata(args, filepath),
+    )
+    return input_pattern
+
+
+def _get_output_files(filepath, output_directory):
+    """
+    Get the paths of the corrected data and correction files for an input file
+
+    Parameters
+    ----------
+    filepath pathlib.Path
+        the path of the input data file
+    output_directory pathlib.Path
+        the directory the outputs are written to
+
+    Returns
+    -------
+    the corrected data file and the correction file, as strings
+
+    """
+    output_directory = os.fspath(output_directory)
+    stem = filepath.stem
+    return (
+        os.path.join(output_directory, f"{stem}_corrected.chi"),
+        os.path.join(output_directory, f"{stem}_cve.chi"),
+    )
+
+
+def _process_file(filepath, output_files, args):
+    """
+    Apply the absorption correction to a single input file and write the outputs
+
+    Parameters
+    ----------
+    filepath pathlib.Path
+        the path of the input data file
+    output_files tuple of str
+        the corrected data file and the correction file, from _get_output_files
+    args argparse.Namespace
+        the preprocessed arguments from the parser
+
+    """
+    outfile, corrfile = output_files
+
+    input_pattern = _load_pattern(filepath, args)
+    absorption_correction = compute_cve(input_pattern, args.mud, args.wavelength)
+    corrected_data = apply_corr(input_pattern, absorption_correction)
+    corrected_data.name = f"Absorption corrected input_data: {input_pattern.name}"
+    corrected_data.dump(outfile, xtype="tth")
+
+    if args.output_correction:
+        absorption_correction.dump(corrfile, xtype="tth")
+
+
 def main():
     args = get_args()
     args = preprocessing_args(args)
 
-    for filepath in args.input_paths:
-        outfilestem = filepath.stem + "_corrected"
-        corrfilestem = filepath.stem + "_cve"
-        outfile = args.output_directory / (outfilestem + ".chi")
-        corrfile = args.output_directory / (corrfilestem + ".chi")
-
-        if outfile.exists() and not args.force_overwrite:
-            sys.exit(
-                f"Output file {str(outfile)} already exists. Please rerun "
-                f"specifying -f if you want to overwrite it."
-            )
-        if corrfile.exists() and args.output_correction and not args.force_overwrite:
-            sys.exit(
-                f"Corrections file {str(corrfile)} was requested and already "
-                f"exists. Please rerun specifying -f if you want to overwrite it."
-            )
-
-        input_pattern = Diffraction_object(wavelength=args.wavelength)
-        xarray, yarray = loadData(filepath, unpack=True)
-        input_pattern.insert_scattering_quantity(
-            xarray,
-            yarray,
-            "tth",
-            scat_quantity="x-ray",
-            name=filepath.stem,
-            metadata=load_metadata(args, filepath),
-        )
-
-        absorption_correction = compute_cve(input_pattern, args.mud, args.wavelength)
-        corrected_data = apply_corr(input_pattern, absorption_correction)
-        corrected_data.name = f"Absorption corrected input_data: {input_pattern.name}"
-        corrected_data.dump(f"{outfile}", xtype="tth")
-
-        if args.output_correction:
-            absorption_correction.dump(f"{corrfile}", xtype="tth")
+    output_files = [_get_output_files(filepath, args.output_directory) for filepath in args.input_paths]
+
+    # inputs that share a stem, e.g. a.xy and sub/a.xy, are written to the same output files
+    has_shared_outputs = len({outfile for outfile, _ in output_files}) < len(output_files)
+
+    if not args.force_overwrite:
+        checked_outfiles = set()
+        for outfile, corrfile in output_files:
+            if os.path.lexists(outfile):
+                sys.exit(
+                    f"Output file {outfile} already exists. Please rerun "
+                    f"specifying -f if you want to overwrite it."
+                )
+            if outfile in checked_outfiles:
+                sys.exit(
+                    f"Output file {outfile} would be written by more than one input file. "
+                    f"Please rerun specifying -f if you want to overwrite it."
+                )
+            checked_outfiles.add(outfile)
+            if args.output_correction and os.path.lexists(corrfile):
+                sys.exit(
+                    f"Corrections file {corrfile} was requested and already "
+                    f"exists. Please rerun specifying -f if you want to overwrite it."
+                )
+
+    # every input file is corrected independently, so they can be spread over worker processes.
+    # Shared outputs are written one after another instead, so the last input wins as it
+    # would in a serial run rather than workers writing the same file at the same time.
+    workers = 1 if has_shared_outputs else min(args.jobs, os.cpu_count() or 1, len(args.input_paths))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_process_file, args.input_paths, output_files, repeat(args)))
+    else:
+        for filepath, filepath_output_files in zip(args.input_paths, output_files):
+            _process_file(filepath, filepath_output_files, args)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 
+from diffpy.labpdfproc import functions
 from diffpy.labpdfproc.functions import Gridded_circle, apply_corr, compute_cve
 from diffpy.utils.scattering_objects.diffraction_objects import Diffraction_object
 
@@ -40,6 +41,17 @@ def test_set_distances_at_angle(inputs, expected):
     assert actual_distances_sorted == pytest.approx(expected_distances_sorted, rel=1e-4, abs=1e-6)
 
 
+@pytest.mark.parametrize("angle", [0, 1, 30, 89.99999999, 90, 120, 140])
+def test_get_path_lengths_at_angle(angle):
+    actual_gs = Gridded_circle(radius=1, n_points_on_diameter=20, mu=1)
+    expected_path_lengths = np.array(
+        [actual_gs.get_path_length(tuple(grid_point), angle) for grid_point in actual_gs._grid_array]
+    ).T
+    actual_path_lengths = actual_gs._get_path_lengths_at_angle(angle)
+    for actual, expected in zip(actual_path_lengths, expected_path_lengths):
+        assert actual == pytest.approx(expected, rel=1e-6, abs=1e-8)
+
+
 params3 = [
     ([1], [1, 1, 0.135335, 0.049787, 0.176921]),
     ([2], [1, 1, 0.018316, 0.002479, 0.031301]),
@@ -72,6 +84,7 @@ def _instantiate_test_do(xarray, yarray, name="test", scat_quantity="x-ray"):
 def test_compute_cve(mocker):
     xarray, yarray = np.array([90, 90.1, 90.2]), np.array([2, 2, 2])
     expected_cve = np.array([0.5, 0.5, 0.5])
+    mocker.patch.dict(functions._CVE_CACHE, clear=True)
     mocker.patch("diffpy.labpdfproc.functions.TTH_GRID", xarray)
     mocker.patch("numpy.interp", return_value=expected_cve)
     input_pattern = _instantiate_test_do(xarray, yarray)
@@ -85,6 +98,17 @@ def test_compute_cve(mocker):
     assert actual_abdo == expected_abdo
 
 
+def test_compute_cve_reuses_cve_for_same_mud(mocker):
+    xarray, yarray = np.array([90, 90.1, 90.2]), np.array([2, 2, 2])
+    mocker.patch.dict(functions._CVE_CACHE, clear=True)
+    mocker.patch("diffpy.labpdfproc.functions.TTH_GRID", np.array([90]))
+    gridded_circle = mocker.spy(functions, "Gridded_circle")
+    first_abdo = compute_cve(_instantiate_test_do(xarray, yarray), mud=0.123, wavelength=1.54)
+    second_abdo = compute_cve(_instantiate_test_do(xarray, 2 * yarray), mud=0.123, wavelength=1.54)
+    assert gridded_circle.call_count == 1
+    assert np.array_equal(first_abdo.on_tth[1], second_abdo.on_tth[1])
+
+
 def test_apply_corr(mocker):
     xarray, yarray = np.array([90, 90.1, 90.2]), np.array([2, 2, 2])
     expected_cve = np.array([0.5, 0.5, 0.5])
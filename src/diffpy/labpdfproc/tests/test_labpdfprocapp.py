@@ -0,0 +1,117 @@
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from diffpy.labpdfproc import labpdfprocapp
+from diffpy.labpdfproc.labpdfprocapp import _load_pattern, get_args, main
+from diffpy.utils.parsers.loaddata import loadData
+
+params_load = [
+    ("good_data.xy", False),  # plain two-column file, read by numpy.loadtxt
+    ("good_data.chi", True),  # file with a header block, falls back to loadData
+]
+
+
+@pytest.mark.parametrize("input_name, uses_loaddata", params_load)
+def test_load_pattern(input_name, uses_loaddata, mocker, user_filesystem):
+    filepath = Path(user_filesystem) / input_name
+    expected_xarray, expected_yarray = loadData(filepath, unpack=True)
+    loaddata = mocker.spy(labpdfprocapp, "loadData")
+    args = get_args(["2.5", str(filepath)])
+    args.wavelength = 0.71
+
+    actual_pattern = _load_pattern(filepath, args)
+    assert loaddata.called == uses_loaddata
+    assert np.array_equal(actual_pattern.on_tth[0], expected_xarray)
+    assert np.array_equal(actual_pattern.on_tth[1], expected_yarray)
+    assert actual_pattern.name == filepath.stem
+
+
+params_jobs = [
+    ([], 1),
+    (["--jobs", "3"], 3),
+    (["-j", "1"], 1),
+]
+
+
+@pytest.mark.parametrize("inputs, expected", params_jobs)
+def test_get_args_jobs(inputs, expected):
+    cli_inputs = ["2.5", "data.xy"] + inputs
+    actual_args = get_args(cli_inputs)
+    assert actual_args.jobs == expected
+
+
+@pytest.mark.parametrize("jobs", ["0", "-3", "two"])
+def test_get_args_jobs_bad(jobs, capsys):
+    cli_inputs = ["2.5", "data.xy", f"--jobs={jobs}"]
+    with pytest.raises(SystemExit):
+        get_args(cli_inputs)
+    assert "argument -j/--jobs: must be a positive integer" in capsys.readouterr().err
+
+
+def test_main_jobs_matches_serial(mocker, user_filesystem):
+    cwd = Path(user_filesystem)
+    home_dir = cwd / "home_dir"
+    mocker.patch("pathlib.Path.home", lambda _: home_dir)
+    mocker.patch("os.cpu_count", return_value=4)
+    os.chdir(cwd)
+    shutil.copy("good_data.chi", "a.chi")
+    with open("b.xy", "w") as f:
+        f.write("1 20\n 3 40\n 5 60\n 7 80")
+    shutil.copy("good_data.txt", "c.txt")
+    inputs = ["a.chi", "b.xy", "c.txt"]
+    expected_outputs = sorted(f"{stem}{suffix}" for stem in "abc" for suffix in ["_corrected.chi", "_cve.chi"])
+
+    mocker.patch.object(sys, "argv", ["labpdfproc", "2.5", *inputs, "-o", "serial"])
+    main()
+    pool = mocker.spy(labpdfprocapp, "ProcessPoolExecutor")
+    mocker.patch.object(sys, "argv", ["labpdfproc", "2.5", *inputs, "-o", "parallel", "--jobs", "2"])
+    main()
+
+    assert pool.call_count == 1
+    assert sorted(os.listdir("serial")) == expected_outputs
+    assert sorted(os.listdir("parallel")) == expected_outputs
+    for output_name in expected_outputs:
+        expected_data = loadData(cwd / "serial" / output_name)
+        actual_data = loadData(cwd / "parallel" / output_name)
+        assert np.array_equal(actual_data, expected_data)
+    assert not np.array_equal(
+        loadData(cwd / "parallel" / "a_corrected.chi"), loadData(cwd / "parallel" / "b_corrected.chi")
+    )
+
+
+def test_main_shared_stem_rejected(mocker, user_filesystem):
+    cwd = Path(user_filesystem)
+    home_dir = cwd / "home_dir"
+    mocker.patch("pathlib.Path.home", lambda _: home_dir)
+    os.chdir(cwd)
+    mocker.patch.object(
+        sys, "argv", ["labpdfproc", "2.5", "good_data.chi", "good_data.xy", "-o", "output", "--jobs", "2"]
+    )
+    expected_msg = (
+        f"Output file {os.path.join(cwd, 'output', 'good_data_corrected.chi')} would be written by more than "
+        f"one input file. Please rerun specifying -f if you want to overwrite it."
+    )
+    with pytest.raises(SystemExit, match=re.escape(expected_msg)):
+        main()
+    assert os.listdir("output") == []
+
+
+def test_main_shared_stem_force_overwrite_is_serial(mocker, user_filesystem):
+    cwd = Path(user_filesystem)
+    home_dir = cwd / "home_dir"
+    mocker.patch("pathlib.Path.home", lambda _: home_dir)
+    mocker.patch("os.cpu_count", return_value=4)
+    os.chdir(cwd)
+    pool = mocker.spy(labpdfprocapp, "ProcessPoolExecutor")
+    mocker.patch.object(
+        sys, "argv", ["labpdfproc", "2.5", "good_data.chi", "good_data.xy", "-o", "output", "--jobs", "2", "-f"]
+    )
+    main()
+    assert pool.call_count == 0
+    assert sorted(os.listdir("output")) == ["good_data_corrected.chi", "good_data_cve.chi"]
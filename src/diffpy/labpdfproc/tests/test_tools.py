@@ -149,6 +149,7 @@ def test_set_output_directory_bad(user_filesystem):
 params2 = [
     ([], [0.71, "Mo"]),
     (["--anode-type", "Ag"], [0.59, "Ag"]),
+    (["--anode-type", "ag"], [0.59, "Ag"]),
     (["--wavelength", "0.25"], [0.25, None]),
     (["--wavelength", "0.25", "--anode-type", "Ag"], [0.25, None]),
 ]
@@ -214,10 +215,8 @@ def test_load_user_metadata(inputs, expected):
 params6 = [
     (
         ["--user-metadata", "facility=", "NSLS II"],
-        [
-            "Please provide key-value pairs in the format key=value. "
-            "For more information, use `labpdfproc --help.`"
-        ],
+        "Please provide key-value pairs in the format key=value. "
+        "For more information, use `labpdfproc --help.`",
     ),
     (
         ["--user-metadata", "favorite", "color=blue"],
@@ -244,7 +243,7 @@ params6 = [
 def test_load_user_metadata_bad(inputs, msg):
     cli_inputs = ["2.5", "data.xy"] + inputs
     actual_args = get_args(cli_inputs)
-    with pytest.raises(ValueError, match=msg[0]):
+    with pytest.raises(ValueError, match=re.escape(msg)):
         actual_args = load_user_metadata(actual_args)
 
 
@@ -318,3 +317,10 @@ def test_load_metadata(mocker, user_filesystem):
             "package_info": {"diffpy.labpdfproc": "1.2.3", "diffpy.utils": "3.3.0"},
         }
         assert actual_metadata == expected_metadata
+
+
+def test_load_metadata_excludes_jobs(user_filesystem):
+    cli_inputs = ["2.5", "data.xy", "--jobs", "2"]
+    actual_args = get_args(cli_inputs)
+    actual_metadata = load_metadata(actual_args, Path(user_filesystem) / "good_data.chi")
+    assert "jobs" not in actual_metadata
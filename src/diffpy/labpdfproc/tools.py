@@ -1,11 +1,13 @@
 import copy
+import os
 from pathlib import Path
 
 from diffpy.utils.tools import get_package_info, get_user_info
 
 WAVELENGTHS = {"Mo": 0.71, "Ag": 0.59, "Cu": 1.54}
 known_sources = [key for key in WAVELENGTHS.keys()]
-METADATA_KEYS_TO_EXCLUDE = ["output_correction", "force_overwrite", "input", "input_paths"]
+_known_sources_lower = {key.lower(): key for key in WAVELENGTHS.keys()}
+METADATA_KEYS_TO_EXCLUDE = ["output_correction", "force_overwrite", "jobs", "input", "input_paths"]
 
 
 def set_output_directory(args):
@@ -25,10 +27,12 @@ def set_output_directory(args):
     If user provides an output directory, use it.
     Otherwise, we set it to the current directory if nothing is provided.
     We then create the directory if it does not exist.
+    An existing regular file at that path still raises FileExistsError.
 
     """
-    output_dir = Path(args.output_directory).resolve() if args.output_directory else Path.cwd().resolve()
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = Path(args.output_directory).resolve() if args.output_directory else Path(os.getcwd())
+    if not output_dir.is_dir():
+        output_dir.mkdir(parents=True, exist_ok=True)
     return output_dir
 
 
@@ -115,14 +119,15 @@ def set_wavelength(args):
     args argparse.Namespace
 
     we raise an ValueError if the input wavelength is non-positive
-    or if the input anode_type is not one of the known sources
+    or if the input anode_type is not one of the known sources.
+    anode_type is matched case-insensitively and stored with its canonical spelling.
 
     """
     if args.wavelength is not None and args.wavelength <= 0:
         raise ValueError(
             "No valid wavelength. Please rerun specifying a known anode_type or a positive wavelength."
         )
-    if not args.wavelength and args.anode_type and args.anode_type not in WAVELENGTHS:
+    if not args.wavelength and args.anode_type and args.anode_type.lower() not in _known_sources_lower:
         raise ValueError(
             f"Anode type not recognized. Please rerun specifying an anode_type from {*known_sources, }."
         )
@@ -130,20 +135,13 @@ def set_wavelength(args):
     if args.wavelength:
         delattr(args, "anode_type")
     elif args.anode_type:
+        args.anode_type = _known_sources_lower[args.anode_type.lower()]
         args.wavelength = WAVELENGTHS[args.anode_type]
     else:
         args.wavelength = WAVELENGTHS["Mo"]
     return args
 
 
-def _load_key_value_pair(s):
-    items = s.split("=")
-    key = items[0].strip()
-    if len(items) > 1:
-        value = "=".join(items[1:])
-    return (key, value)
-
-
 def load_user_metadata(args):
     """
     Load user metadata into the provided argparse Namespace, raise ValueError if in incorrect format
@@ -159,21 +157,26 @@ def load_user_metadata(args):
 
     """
 
-    reserved_keys = vars(args).keys()
-
-    if args.user_metadata:
-        for item in args.user_metadata:
-            if "=" not in item:
-                raise ValueError(
-                    "Please provide key-value pairs in the format key=value. "
-                    "For more information, use `labpdfproc --help.`"
-                )
-            key, value = _load_key_value_pair(item)
-            if key in reserved_keys:
-                raise ValueError(f"{key} is a reserved name.  Please rerun using a different key name. ")
-            if hasattr(args, key):
-                raise ValueError(f"Please do not specify repeated keys: {key}. ")
-            setattr(args, key, value)
+    if not args.user_metadata:
+        delattr(args, "user_metadata")
+        return args
+
+    reserved_keys = set(vars(args))
+    user_keys = set()
+    for item in args.user_metadata:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(
+                "Please provide key-value pairs in the format key=value. "
+                "For more information, use `labpdfproc --help.`"
+            )
+        key = key.strip()
+        if key in reserved_keys:
+            raise ValueError(f"{key} is a reserved name.  Please rerun using a different key name. ")
+        if key in user_keys:
+            raise ValueError(f"Please do not specify repeated keys: {key}. ")
+        user_keys.add(key)
+        setattr(args, key, value)
     delattr(args, "user_metadata")
     return args
 
@@ -254,9 +257,9 @@ def load_metadata(args, filepath):
     A dictionary with relevant arguments from the parser
     """
 
-    metadata = copy.deepcopy(vars(args))
-    for key in METADATA_KEYS_TO_EXCLUDE:
-        metadata.pop(key, None)
+    metadata = copy.deepcopy(
+        {key: value for key, value in vars(args).items() if key not in METADATA_KEYS_TO_EXCLUDE}
+    )
     metadata["input_directory"] = str(filepath)
     metadata["output_directory"] = str(metadata["output_directory"])
     return metadata